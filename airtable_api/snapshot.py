@@ -0,0 +1,260 @@
+"""
+Shared, memory-mapped snapshot of the Airtable tables.
+
+One server process (whoever wins the file lock at startup, or the
+`refresh_airtable_snapshot` management command) fetches Leaders, Cities and
+Enrollments and writes them to a single file. Each table is stored as the
+exact JSON body the view returns ({"records": [...]}). Every worker maps that
+file read-only, so the long-lived copy of the data lives once in the OS page
+cache instead of once per worker as decoded Python objects. A request copies
+its table's bytes out of the map into a short-lived `bytes` for the response
+body; no JSON is decoded or re-encoded.
+
+File layout:
+  line 1   JSON header: {"created": <unix ts>, "tables": {name: [offset, length]}}
+  rest     concatenated response bodies, addressed by the header offsets
+
+Refreshes write a temp file in the same directory and os.replace() it over
+the old one, which is atomic on POSIX. Readers notice the new inode on their
+next request and remap. Responses already hold their own copy of the bytes,
+so the old map can be closed straight away.
+
+Once the file is older than AIRTABLE_SNAPSHOT_MAX_AGE, the next request
+starts a background warm() in its worker. The file lock makes sure only one
+worker fetches, and requests keep being served from the current file
+meanwhile. Reads are skipped when AIRTABLE_SNAPSHOT_WARM is off or the file
+is older than AIRTABLE_SNAPSHOT_MAX_STALE, and the views then fetch live.
+"""
+
+import json
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows — no cross-process lock, replace is still atomic
+    fcntl = None
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TABLES = ('Leaders', 'Cities', 'Enrollments')
+
+# warm() results
+WROTE = 'wrote'  # this call fetched and wrote a new snapshot
+FRESH = 'fresh'  # the existing snapshot is younger than max_age
+BUSY = 'busy'    # another process held the lock for the whole wait
+
+# Seconds to wait after a failed background refresh before trying again
+REFRESH_RETRY = 60
+
+
+# ── Writing ───────────────────────────────────────────────────
+
+def write_snapshot(path, tables):
+    """Atomically write {table_name: records} to path."""
+    bodies = {name: json.dumps({'records': records}).encode() for name, records in tables.items()}
+
+    index, offset = {}, 0
+    for name, body in bodies.items():
+        index[name] = [offset, len(body)]
+        offset += len(body)
+    header = json.dumps({'created': time.time(), 'tables': index}).encode() + b'\n'
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            for body in bodies.values():
+                f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def fetch_tables(fetch):
+    """Fetch every table with fetch(name) -> (records, error). Raises on error."""
+    tables = {}
+    for name in TABLES:
+        records, error = fetch(name)
+        if error:
+            raise RuntimeError(f'{name}: {error}')
+        tables[name] = records
+    return tables
+
+
+def snapshot_age(path):
+    """Seconds since the snapshot at path was written, or None if missing."""
+    try:
+        return time.time() - os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def _acquire(lock, wait):
+    """Try to take an exclusive flock for up to wait seconds."""
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+
+
+def warm(fetch, path=None, max_age=None, force=False, lock_wait=None):
+    """
+    Make sure a snapshot younger than max_age exists at path.
+
+    Holds an exclusive lock while fetching, so when N workers start at once
+    only the first one hits Airtable. The rest wait up to lock_wait seconds,
+    then see the fresh file and return FRESH. If the lock is still held
+    after that (Airtable slow), they give up and return BUSY. Returns WROTE
+    if this call wrote a new snapshot; fetch errors propagate.
+    """
+    path = path or settings.AIRTABLE_SNAPSHOT_PATH
+    max_age = settings.AIRTABLE_SNAPSHOT_MAX_AGE if max_age is None else max_age
+    lock_wait = settings.AIRTABLE_SNAPSHOT_LOCK_WAIT if lock_wait is None else lock_wait
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.lock', 'a') as lock:
+        if fcntl and not _acquire(lock, lock_wait):
+            return BUSY
+        try:
+            age = snapshot_age(path)
+            if not force and age is not None and age < max_age:
+                return FRESH
+            write_snapshot(path, fetch_tables(fetch))
+            return WROTE
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+_refreshing = False
+_refresh_lock = threading.Lock()
+_retry_at = 0.0
+
+
+def _refresh(fetch, path):
+    global _refreshing, _retry_at
+    try:
+        if warm(fetch, path, lock_wait=0) == WROTE:
+            logger.info('Airtable snapshot refreshed at %s', path)
+    except Exception as e:
+        logger.warning('Could not refresh Airtable snapshot: %s', e)
+        _retry_at = time.monotonic() + REFRESH_RETRY
+    finally:
+        _refreshing = False
+
+
+def refresh_in_background(fetch, path=None):
+    """
+    Start a warm() in a daemon thread if the snapshot is missing or older
+    than AIRTABLE_SNAPSHOT_MAX_AGE. At most one runs per process, and it
+    does not wait for the lock: if another worker is already fetching, it
+    returns straight away. After a failure, retries are spaced
+    REFRESH_RETRY seconds apart. Returns True if a thread was started.
+    """
+    global _refreshing
+    path = path or settings.AIRTABLE_SNAPSHOT_PATH
+    age = snapshot_age(path)
+    if age is not None and age < settings.AIRTABLE_SNAPSHOT_MAX_AGE:
+        return False
+    with _refresh_lock:
+        if _refreshing or time.monotonic() < _retry_at:
+            return False
+        _refreshing = True
+    threading.Thread(
+        target=_refresh, args=(fetch, path), name='airtable-snapshot-refresh', daemon=True,
+    ).start()
+    return True
+
+
+def _after_fork_in_child():
+    # A refresh thread does not survive fork(); let the child start its own.
+    global _refreshing, _refresh_lock
+    _refresh_lock = threading.Lock()
+    _refreshing = False
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+# ── Reading ───────────────────────────────────────────────────
+
+class SnapshotReader:
+    """Per-process read-only view of the shared snapshot file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._identity = None
+        self._mm = None
+        self._tables = {}
+        self._data_start = 0
+
+    def _remap(self, identity):
+        with open(self.path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = mm.find(b'\n')
+        header = json.loads(mm[:header_end])
+
+        old = self._mm
+        self._mm = mm
+        self._tables = header['tables']
+        self._data_start = header_end + 1
+        self._identity = identity
+        if old is not None:
+            old.close()
+
+    def read_table(self, name):
+        """Return a copy of the pre-serialized response body for name, or None."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        if time.time() - st.st_mtime > settings.AIRTABLE_SNAPSHOT_MAX_STALE:
+            return None
+        identity = (st.st_ino, st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            if identity != self._identity:
+                try:
+                    self._remap(identity)
+                except (OSError, ValueError) as e:
+                    logger.warning('Could not map Airtable snapshot %s: %s', self.path, e)
+                    return None
+            span = self._tables.get(name)
+            if span is None:
+                return None
+            start = self._data_start + span[0]
+            return self._mm[start:start + span[1]]
+
+
+_reader = None
+
+
+def get_reader():
+    """The process-wide reader, or None when the snapshot is disabled."""
+    global _reader
+    if not settings.AIRTABLE_SNAPSHOT_WARM:
+        return None
+    if _reader is None or _reader.path != settings.AIRTABLE_SNAPSHOT_PATH:
+        _reader = SnapshotReader(settings.AIRTABLE_SNAPSHOT_PATH)
+    return _reader
@@ -0,0 +1,170 @@
+"""
+Tests for the /api/query bitmap engine.
+
+Every query is checked against a brute-force scan of the same rows, at
+table sizes around the BLOCK_ROWS boundary so partial, full and multiple
+blocks (and both dense and blocked bitmaps) are exercised. Needs only the
+standard library:
+
+    python -m unittest airtable_api.tests
+"""
+
+import random
+import unittest
+
+from .query_engine import BLOCK_ROWS, COMPLETED, DIMENSIONS, QueryEngine, QueryError
+
+STATUSES = (COMPLETED, 'In Progress', 'Not Started', '')
+COURSES = ('Data Analytics', 'Performance Management', 'Open Data', 'Budgeting', 'Leadership', '')
+CENTERS = ('BCPI', 'GovEx')
+REGIONS = ('Mid-Atlantic', 'Midwest', 'Northeast', 'South', 'West')
+
+
+def make_dataset(n_rows, seed=0):
+    rng = random.Random(seed)
+    cities = [
+        {'name': f'City {i}', 'state': f'S{i % 12}', 'region': REGIONS[i % len(REGIONS)]}
+        for i in range(40)
+    ]
+    enrollments = []
+    for _ in range(n_rows):
+        city = rng.choice(cities)
+        month = f'{rng.randint(2021, 2024)}-{rng.randint(1, 12):02d}'
+        enrollments.append({
+            'city': city['name'],
+            'state': city['state'],
+            'program_center': rng.choice(CENTERS),
+            'course_name': rng.choice(COURSES),
+            'completion_status': rng.choice(STATUSES),
+            'start_date': f'{month}-{rng.randint(1, 28):02d}' if rng.random() > 0.05 else '',
+            'score': rng.randint(0, 100) if rng.random() > 0.3 else None,
+        })
+    return enrollments, cities
+
+
+def reference_rows(enrollments, cities):
+    region_by_city = {(c['name'], c['state']): c['region'] for c in cities}
+    rows = []
+    for e in enrollments:
+        rows.append({
+            'city': e['city'],
+            'state': e['state'],
+            'region': region_by_city.get((e['city'], e['state']), ''),
+            'program_center': e['program_center'],
+            'course_name': e['course_name'],
+            'completion_status': e['completion_status'],
+            'start_month': e['start_date'][:7],
+            'score': e['score'],
+        })
+    return rows
+
+
+def reference_aggregate(rows):
+    count = len(rows)
+    completed = sum(1 for r in rows if r['completion_status'] == COMPLETED)
+    scores = [r['score'] for r in rows if r['score'] is not None]
+    return {
+        'count': count,
+        'completed': completed,
+        'completion_rate': round(completed / count, 4) if count else None,
+        'avg_score': round(sum(scores) / len(scores), 2) if scores else None,
+    }
+
+
+def reference_query(rows, filters=None, group_by=None, month_from=None, month_to=None):
+    selected = [
+        r for r in rows
+        if all(r[dim] in values for dim, values in (filters or {}).items())
+        and (not (month_from or month_to) or (
+            r['start_month']
+            and (month_from is None or r['start_month'] >= month_from)
+            and (month_to is None or r['start_month'] <= month_to)
+        ))
+    ]
+    result = {'total': reference_aggregate(selected)}
+    if group_by is not None:
+        buckets = {}
+        for r in selected:
+            buckets.setdefault(r[group_by], []).append(r)
+        groups = [{'value': value, **reference_aggregate(group)} for value, group in buckets.items()]
+        groups.sort(key=lambda g: (-g['count'], g['value']))
+        result['group_by'] = group_by
+        result['groups'] = groups
+    return result
+
+
+QUERIES = [
+    {},
+    {'group_by': 'city'},
+    {'group_by': 'start_month'},
+    {'filters': {'region': ['Midwest', 'West']}, 'group_by': 'city'},
+    {'filters': {'city': ['City 3', 'City 17']}, 'group_by': 'course_name'},
+    {
+        'filters': {'program_center': ['GovEx'], 'completion_status': [COMPLETED, 'In Progress']},
+        'group_by': 'state',
+    },
+    {'filters': {'course_name': ['Open Data']}, 'month_from': '2022-03', 'month_to': '2023-11',
+     'group_by': 'start_month'},
+    {'month_from': '2024-06', 'group_by': 'region'},
+    {'month_to': '2021-01', 'group_by': 'completion_status'},
+    {'filters': {'course_name': ['']}, 'group_by': 'program_center'},
+    {'filters': {'region': ['Nowhere']}, 'group_by': 'city'},
+]
+
+
+class QueryEngineEquivalenceTests(unittest.TestCase):
+    def assert_matches_reference(self, n_rows):
+        enrollments, cities = make_dataset(n_rows, seed=n_rows)
+        engine = QueryEngine(enrollments, cities)
+        rows = reference_rows(enrollments, cities)
+        for params in QUERIES:
+            with self.subTest(n_rows=n_rows, **params):
+                self.assertEqual(engine.query(**params), reference_query(rows, **params))
+        return engine
+
+    def test_empty_table(self):
+        self.assert_matches_reference(0)
+
+    def test_single_row(self):
+        self.assert_matches_reference(1)
+
+    def test_one_short_of_a_block(self):
+        self.assert_matches_reference(BLOCK_ROWS - 1)
+
+    def test_exactly_one_block(self):
+        self.assert_matches_reference(BLOCK_ROWS)
+
+    def test_one_past_a_block(self):
+        self.assert_matches_reference(BLOCK_ROWS + 1)
+
+    def test_multiple_blocks_mix_dense_and_blocked_bitmaps(self):
+        engine = self.assert_matches_reference(30000)
+        self.assertGreater(engine.n_blocks, 1)
+        forms = {type(bits) for dim in DIMENSIONS for bits in engine.indexes[dim].values()}
+        self.assertEqual(forms, {int, dict})
+
+
+class QueryEngineValidationTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = QueryEngine(*make_dataset(100))
+
+    def test_unknown_filter_dimension(self):
+        with self.assertRaises(QueryError):
+            self.engine.query({'regoin': ['West']})
+
+    def test_unknown_group_by(self):
+        with self.assertRaises(QueryError):
+            self.engine.query(group_by='score')
+
+    def test_malformed_months(self):
+        for month in ('2023-13', '2023-00', '2023-1', '23-01', 'garbage'):
+            with self.subTest(month=month), self.assertRaises(QueryError):
+                self.engine.query(month_from=month)
+
+    def test_reversed_month_range(self):
+        with self.assertRaises(QueryError):
+            self.engine.query(month_from='2024-01', month_to='2023-01')
+
+
+if __name__ == '__main__':
+    unittest.main()
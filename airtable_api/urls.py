@@ -5,4 +5,5 @@ urlpatterns = [
     path('enrollments', views.enrollments, name='enrollments'),
     path('cities', views.cities, name='cities'),
     path('leaders', views.leaders, name='leaders'),
+    path('query', views.query, name='query'),
 ]
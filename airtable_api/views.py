@@ -5,17 +5,27 @@ Endpoints:
   /api/enrollments
   /api/cities
   /api/leaders
+  /api/query        — server-side cross-filter aggregations (see query_engine.py)
 
-Credentials are kept server-side via environment variables.
+Credentials are kept server-side via environment variables. The three
+table endpoints serve from the shared memory-mapped snapshot (snapshot.py)
+when it is enabled and fresh enough, and fall back to a live Airtable fetch
+otherwise.
 """
 
 import json
+import time
 import urllib.request
 import urllib.parse
 import urllib.error
 
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+
+from . import snapshot
+from .query_engine import DIMENSIONS, QueryError, get_engine
+
+QUERY_PARAMS = frozenset(DIMENSIONS) | {'group_by', 'start_month_from', 'start_month_to'}
 
 
 def _fetch_airtable_table(table_name):
@@ -46,10 +56,12 @@ def _fetch_airtable_table(table_name):
 
         req = urllib.request.Request(url, headers=headers)
         try:
-            with urllib.request.urlopen(req) as resp:
+            with urllib.request.urlopen(req, timeout=settings.AIRTABLE_TIMEOUT) as resp:
                 data = json.loads(resp.read().decode())
         except urllib.error.HTTPError as e:
             return None, f'Airtable API error: {e.code} {e.reason}'
+        except (urllib.error.URLError, TimeoutError) as e:
+            return None, f'Airtable API unreachable: {getattr(e, "reason", e)}'
 
         all_records.extend(data.get('records', []))
         offset = data.get('offset')
@@ -64,6 +76,13 @@ def _airtable_view(request, table_name):
     if request.method != 'GET':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
 
+    reader = snapshot.get_reader()
+    body = reader.read_table(table_name) if reader else None
+    if reader and settings.AIRTABLE_BASE_ID and settings.AIRTABLE_PAT:
+        snapshot.refresh_in_background(_fetch_airtable_table)
+    if body is not None:
+        return HttpResponse(body, content_type='application/json')
+
     records, error = _fetch_airtable_table(table_name)
     if error:
         return JsonResponse({'error': error}, status=500)
@@ -86,3 +105,57 @@ def cities(request):
 def leaders(request):
     """GET /api/leaders — proxy to Airtable Leaders table."""
     return _airtable_view(request, 'Leaders')
+
+
+def query(request):
+    """
+    GET /api/query — filtered group-by aggregations over the cleaned enrollments.
+
+    Query params:
+      city, region, state, program_center, course_name, completion_status,
+      start_month   — repeat a param to OR values (?region=A&region=B)
+      start_month_from, start_month_to — inclusive 'YYYY-MM' range
+      group_by      — one of the dimensions above
+
+    Any other param is rejected with 400. Returns 503 (with Retry-After)
+    while the engine is still being built after startup.
+
+    Example: completion rate for GovEx courses in Mid-Atlantic cities in 2023
+      /api/query?program_center=GovEx&region=Mid-Atlantic
+                &start_month_from=2023-01&start_month_to=2023-12&group_by=city
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+
+    unknown = sorted(set(request.GET) - QUERY_PARAMS)
+    if unknown:
+        return JsonResponse({'error': f'Unknown query parameter(s): {", ".join(unknown)}'}, status=400)
+
+    filters = {dim: request.GET.getlist(dim) for dim in DIMENSIONS if dim in request.GET}
+    group_by = request.GET.get('group_by') or None
+    month_from = request.GET.get('start_month_from') or None
+    month_to = request.GET.get('start_month_to') or None
+
+    try:
+        engine = get_engine(settings.ENROLLMENT_DATA_PATH)
+    except OSError as e:
+        return JsonResponse({'error': f'Enrollment data unavailable: {e}'}, status=500)
+    if engine is None:
+        response = JsonResponse({'error': 'Query engine is loading, retry shortly'}, status=503)
+        response['Retry-After'] = '5'
+        return response
+
+    started = time.perf_counter()
+    try:
+        result = engine.query(filters, group_by, month_from, month_to)
+    except QueryError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    return JsonResponse({
+        'filters': filters,
+        'start_month_from': month_from,
+        'start_month_to': month_to,
+        **result,
+        'elapsed_ms': round(elapsed_ms, 3),
+    })
@@ -46,6 +46,24 @@ CORS_ALLOW_ALL_ORIGINS = DEBUG  # wide-open in dev, explicit in prod
 # Airtable credentials (loaded from environment / .env)
 AIRTABLE_BASE_ID = os.environ.get('AIRTABLE_BASE_ID', '')
 AIRTABLE_PAT = os.environ.get('AIRTABLE_PAT', '')
+AIRTABLE_TIMEOUT = float(os.environ.get('AIRTABLE_TIMEOUT', '10'))  # seconds per HTTP request
+
+# Shared Airtable snapshot: warmed by server processes at startup, memory-mapped
+# by every worker. AIRTABLE_SNAPSHOT_WARM=False disables both warming and reads.
+AIRTABLE_SNAPSHOT_PATH = os.environ.get(
+    'AIRTABLE_SNAPSHOT_PATH',
+    str(BASE_DIR / '.cache' / 'airtable_snapshot.bin'),
+)
+AIRTABLE_SNAPSHOT_MAX_AGE = int(os.environ.get('AIRTABLE_SNAPSHOT_MAX_AGE', '300'))  # seconds; older → background refresh
+AIRTABLE_SNAPSHOT_WARM = os.environ.get('AIRTABLE_SNAPSHOT_WARM', 'True').lower() in ('true', '1', 'yes')
+AIRTABLE_SNAPSHOT_MAX_STALE = int(os.environ.get('AIRTABLE_SNAPSHOT_MAX_STALE', '3600'))  # older → live fetch
+AIRTABLE_SNAPSHOT_LOCK_WAIT = float(os.environ.get('AIRTABLE_SNAPSHOT_LOCK_WAIT', '15'))  # seconds
+
+# Cleaned enrollment data loaded by the /api/query engine (output of src/parse_data.py)
+ENROLLMENT_DATA_PATH = os.environ.get(
+    'ENROLLMENT_DATA_PATH',
+    str(BASE_DIR / 'data' / 'cleaned' / 'enrollment_data.json'),
+)
 
 # Minimal settings — no database, no templates needed for a pure API
 DATABASES = {}
@@ -5,5 +5,10 @@ WSGI config for JHU Enrollment backend.
 import os
 from django.core.wsgi import get_wsgi_application
 
+from airtable_api.apps import mark_server_process
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+# Opt in to the startup work in AirtableApiConfig.ready() (query engine
+# build, snapshot warm); manage.py commands, tests and scripts skip it.
+mark_server_process()
 application = get_wsgi_application()
@@ -7,9 +7,14 @@ Usage (PowerShell):
     # Optional (only if your workspace requires it for Metadata API):
     $env:AIRTABLE_CLIENT_SECRET = "..."
     py src/airtable_upload.py
+    py src/airtable_upload.py --profile --trace-memory   # per-stage timings
 
 Dependencies:
-    pip install pandas requests
+    pip install requests
+
+requests is imported lazily (only when a call hits the network) and pandas
+is not needed at all: records are built from the stdlib row dicts returned
+by `parse_core.parse_enrollment_records`.
 """
 
 import os
@@ -18,12 +23,9 @@ import time
 from pathlib import Path
 from typing import Any, Dict, List
 
-import pandas as pd
-import requests
-
-# Ensure we can import parse_data.py from the same folder as this script
+# Ensure we can import parse_core.py from the same folder as this script
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from parse_data import parse_enrollment_csv  # noqa: E402
+from parse_core import parse_enrollment_records  # noqa: E402
 
 
 AIRTABLE_API_URL = "https://api.airtable.com/v0"
@@ -55,6 +57,8 @@ def get_base_id() -> str:
 
 
 def get_base_schema(base_id: str, headers: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    import requests
+
     url = f"https://api.airtable.com/v0/meta/bases/{base_id}/tables"
     resp = requests.get(url, headers=headers, timeout=30)
     if resp.status_code != 200:
@@ -76,6 +80,8 @@ def create_field(
     headers: Dict[str, str],
 ) -> bool:
     """Create a single field in a table. field_config = {"type": ..., "options": ...}"""
+    import requests
+
     url = f"https://api.airtable.com/v0/meta/bases/{base_id}/tables/{table_id}/fields"
     payload = {"name": field_name, **field_config}
 
@@ -114,6 +120,8 @@ def batch_create_records(
     records: List[Dict[str, Any]],
     headers: Dict[str, str],
 ) -> List[str]:
+    import requests
+
     url = f"{AIRTABLE_API_URL}/{base_id}/{table_name}"
     created_ids: List[str] = []
 
@@ -177,85 +185,107 @@ ENROLLMENTS_FIELDS = {
 
 
 def main() -> None:
+    # Only the CLI needs argparse and the profiling hooks (cProfile, pstats, tracemalloc)
+    import argparse
+
+    from profiling import StageProfiler, add_profiling_arguments
+
+    parser = argparse.ArgumentParser(description="Upload cleaned enrollment data to Airtable.")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
     base_dir = Path(__file__).resolve().parent.parent
     csv_path = base_dir / "data" / "enrollment_data.csv"
+    profiler = StageProfiler.from_args(args, "airtable_upload", str(base_dir / "data" / "cleaned"))
 
-    print("Parsing enrollment data...")
-    leaders_df, cities_df, enrollments_df = parse_enrollment_csv(str(csv_path))
-    print(f"   Parsed {len(leaders_df)} leaders, {len(cities_df)} cities, {len(enrollments_df)} enrollments")
-
-    headers = get_headers()
-    base_id = get_base_id()
-
-    print("\nReading base schema...")
-    schema = get_base_schema(base_id, headers)
-
-    for table_name in ["Leaders", "Cities", "Enrollments"]:
-        if table_name not in schema:
-            print(f"  Table '{table_name}' not found! Please create it in Airtable.")
-            return
-
-    print("\nCreating fields...")
-    print("  Leaders table...")
-    ensure_fields(base_id, schema["Leaders"]["id"], schema["Leaders"]["fields"], LEADERS_FIELDS, headers)
-    print("  Cities table...")
-    ensure_fields(base_id, schema["Cities"]["id"], schema["Cities"]["fields"], CITIES_FIELDS, headers)
-    print("  Enrollments table...")
-    ensure_fields(base_id, schema["Enrollments"]["id"], schema["Enrollments"]["fields"], ENROLLMENTS_FIELDS, headers)
-
-    print("\nUploading Leaders...")
-    leader_records: List[Dict[str, Any]] = []
-    for _, row in leaders_df.iterrows():
-        leader_records.append(
-            {
-                "Record ID": int(row["record_id"]),
-                "Name": row["name"],
-                "Email": row["email"],
-                "Title": row["title"],
-                "Tenure Start": row["tenure_start"],
-                "Tenure End": row["tenure_end"],
-                "Joined Date": row["joined_date"],
-            }
-        )
-    batch_create_records(base_id, "Leaders", leader_records, headers)
-
-    print("\nUploading Cities...")
-    city_records: List[Dict[str, Any]] = []
-    for _, row in cities_df.iterrows():
-        city_records.append(
-            {
-                "City": row["name"],
-                "State": row["state"],
-                "Population": int(row["population"]),
-                "Region": row["region"],
-                "Budget": row["budget"],
-            }
-        )
-    batch_create_records(base_id, "Cities", city_records, headers)
-
-    print("\nUploading Enrollments...")
-    enrollment_records: List[Dict[str, Any]] = []
-    for _, row in enrollments_df.iterrows():
-        record: Dict[str, Any] = {
-            "Course Name": row["course_name"],
-            "Duration (Weeks)": int(row["duration_weeks"]),
-            "Start Date": row["start_date"],
-            "Program Center": row["program_center"],
-            "Status": row["completion_status"],
-            "Leader Name": row["leader_name"],
-            "City": row["city"],
-            "State": row["state"],
-        }
-        if pd.notna(row.get("end_date")) and row.get("end_date"):
-            record["End Date"] = row["end_date"]
-        if pd.notna(row.get("score")):
-            record["Score (%)"] = int(row["score"])
-        enrollment_records.append(record)
-
-    batch_create_records(base_id, "Enrollments", enrollment_records, headers)
-
-    print("\nUpload complete!")
-    print(f"   View your base: https://airtable.com/{base_id}")
+    try:
+        print("Parsing enrollment data...")
+        with profiler.stage("parse_csv"):
+            leaders, cities, enrollments = parse_enrollment_records(str(csv_path))
+        print(f"   Parsed {len(leaders)} leaders, {len(cities)} cities, {len(enrollments)} enrollments")
+
+        headers = get_headers()
+        base_id = get_base_id()
+
+        print("\nReading base schema...")
+        with profiler.stage("read_schema"):
+            schema = get_base_schema(base_id, headers)
+
+        for table_name in ["Leaders", "Cities", "Enrollments"]:
+            if table_name not in schema:
+                print(f"  Table '{table_name}' not found! Please create it in Airtable.")
+                return
+
+        print("\nCreating fields...")
+        with profiler.stage("ensure_fields"):
+            print("  Leaders table...")
+            ensure_fields(base_id, schema["Leaders"]["id"], schema["Leaders"]["fields"], LEADERS_FIELDS, headers)
+            print("  Cities table...")
+            ensure_fields(base_id, schema["Cities"]["id"], schema["Cities"]["fields"], CITIES_FIELDS, headers)
+            print("  Enrollments table...")
+            ensure_fields(base_id, schema["Enrollments"]["id"], schema["Enrollments"]["fields"], ENROLLMENTS_FIELDS, headers)
+
+        print("\nUploading Leaders...")
+        with profiler.stage("build_leaders"):
+            leader_records: List[Dict[str, Any]] = []
+            for row in leaders:
+                leader_records.append(
+                    {
+                        "Record ID": int(row["record_id"]),
+                        "Name": row["name"],
+                        "Email": row["email"],
+                        "Title": row["title"],
+                        "Tenure Start": row["tenure_start"],
+                        "Tenure End": row["tenure_end"],
+                        "Joined Date": row["joined_date"],
+                    }
+                )
+        with profiler.stage("upload_leaders"):
+            batch_create_records(base_id, "Leaders", leader_records, headers)
+
+        print("\nUploading Cities...")
+        with profiler.stage("build_cities"):
+            city_records: List[Dict[str, Any]] = []
+            for row in cities:
+                city_records.append(
+                    {
+                        "City": row["name"],
+                        "State": row["state"],
+                        "Population": int(row["population"]),
+                        "Region": row["region"],
+                        "Budget": row["budget"],
+                    }
+                )
+        with profiler.stage("upload_cities"):
+            batch_create_records(base_id, "Cities", city_records, headers)
+
+        print("\nUploading Enrollments...")
+        with profiler.stage("build_enrollments"):
+            enrollment_records: List[Dict[str, Any]] = []
+            for row in enrollments:
+                record: Dict[str, Any] = {
+                    "Course Name": row["course_name"],
+                    "Duration (Weeks)": int(row["duration_weeks"]),
+                    "Start Date": row["start_date"],
+                    "Program Center": row["program_center"],
+                    "Status": row["completion_status"],
+                    "Leader Name": row["leader_name"],
+                    "City": row["city"],
+                    "State": row["state"],
+                }
+                if row.get("end_date"):
+                    record["End Date"] = row["end_date"]
+                if row.get("score") is not None:
+                    record["Score (%)"] = int(row["score"])
+                enrollment_records.append(record)
+        with profiler.stage("upload_enrollments"):
+            batch_create_records(base_id, "Enrollments", enrollment_records, headers)
+
+        print("\nUpload complete!")
+        print(f"   View your base: https://airtable.com/{base_id}")
+    finally:
+        # Report even when a stage fails — a failing slow run is when it matters
+        profiler.report()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+"""
+bench_startup.py — Measure cold import time for each entry point.
+
+Every sample runs in a fresh interpreter, so nothing is cached between
+runs. For each entry point we report the median time spent importing it
+and the median wall time of the whole process (interpreter start included).
+
+Usage:
+    python src/bench_startup.py
+    python src/bench_startup.py --runs 20 --max-import-ms 150   # CI gate
+
+The script exits non-zero if any entry point fails to import, or, with
+--max-import-ms, if any median import time exceeds the budget. Regressions
+(e.g. an eager pandas import creeping back into parse_core, or a missing
+dependency) therefore fail the build.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# (label, setup code, import statement). Setup runs before the timer starts.
+ENTRY_POINTS = [
+    ("interpreter (baseline)", "", "pass"),
+    ("src/parse_core.py", "", "import parse_core"),
+    ("src/parse_data.py", "", "import parse_data"),
+    ("src/airtable_upload.py", "", "import airtable_upload"),
+    (
+        "backend/wsgi.py (Django worker)",
+        # Snapshot warming is network I/O, not import cost — keep it out of the budget
+        "import os; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings'); "
+        "os.environ['AIRTABLE_SNAPSHOT_WARM'] = 'False'",
+        # wsgi alone never loads the URLconf; the first request does. Import it
+        # too so views, query_engine and snapshot are part of the measurement.
+        "import backend.wsgi; import backend.urls",
+    ),
+]
+
+SNIPPET = """\
+import time
+{setup}
+_t = time.perf_counter()
+{statement}
+print(time.perf_counter() - _t)
+"""
+
+
+def run_once(setup: str, statement: str) -> Tuple[Optional[float], float, str]:
+    """Run one cold import. Returns (import seconds or None, process seconds, error)."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(BASE_DIR), str(BASE_DIR / "src"), env.get("PYTHONPATH", "")]
+    ).rstrip(os.pathsep)
+
+    code = SNIPPET.format(setup=setup, statement=statement)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=str(BASE_DIR),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return None, wall, lines[-1] if lines else f"exit code {proc.returncode}"
+    return float(proc.stdout.strip().splitlines()[-1]), wall, ""
+
+
+def positive_int(value: str) -> int:
+    runs = int(value)
+    if runs < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return runs
+
+
+def bench(runs: int) -> List[Tuple[str, Optional[float], Optional[float], str]]:
+    results = []
+    for label, setup, statement in ENTRY_POINTS:
+        imports: List[float] = []
+        walls: List[float] = []
+        error = ""
+        for _ in range(runs):
+            import_s, wall_s, error = run_once(setup, statement)
+            if import_s is None:
+                break
+            imports.append(import_s)
+            walls.append(wall_s)
+        if error:
+            results.append((label, None, None, error))
+        else:
+            results.append((label, statistics.median(imports), statistics.median(walls), ""))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cold import time of each entry point.")
+    parser.add_argument("--runs", type=positive_int, default=10, help="Fresh interpreters per entry point.")
+    parser.add_argument(
+        "--max-import-ms",
+        type=float,
+        default=None,
+        help="Fail (exit 1) if any median import time exceeds this budget.",
+    )
+    args = parser.parse_args()
+
+    print(f"🚀 Startup benchmark ({args.runs} runs each, median)")
+    print(f"   {'entry point':<34}{'import (ms)':>12}{'process (ms)':>14}")
+
+    over_budget = []
+    failed = []
+    for label, import_s, wall_s, error in bench(args.runs):
+        if error:
+            failed.append(label)
+            print(f"   {label:<34}{'n/a':>12}{'n/a':>14}   ✗ {error}")
+            continue
+        import_ms, wall_ms = import_s * 1000, wall_s * 1000
+        flag = ""
+        if args.max_import_ms is not None and import_ms > args.max_import_ms:
+            over_budget.append(label)
+            flag = "   ✗ over budget"
+        print(f"   {label:<34}{import_ms:>12.1f}{wall_ms:>14.1f}{flag}")
+
+    if failed:
+        print(f"\n✗ {len(failed)} entry point(s) failed to import")
+    if over_budget:
+        print(f"\n✗ {len(over_budget)} entry point(s) over {args.max_import_ms:.0f} ms budget")
+    if failed or over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+profiling.py — Opt-in per-stage profiling for the batch CLIs.
+
+Both `parse_data.py` and `airtable_upload.py` accept `--profile` and
+`--trace-memory`. Each pipeline stage is wrapped in `StageProfiler.stage()`,
+which records wall time and CPU time, and optionally:
+
+- a cProfile dump per stage (`<name>.<stage>.prof`, readable by snakeviz,
+  `python -m pstats`, etc.)
+- a collapsed-stack file for the whole run (`<name>.collapsed`, readable by
+  flamegraph.pl, speedscope, inferno)
+- the peak traced allocation per stage via tracemalloc
+
+Files are written to a `profile/` folder next to the cleaned output.
+"""
+
+import argparse
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+# ---------------------------------------------------------------------------
+# CLI helpers
+# ---------------------------------------------------------------------------
+
+def add_profiling_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the shared --profile / --trace-memory flags on a CLI parser."""
+    group = parser.add_argument_group("profiling")
+    group.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each stage and write cProfile + collapsed-stack files.",
+    )
+    group.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Report the peak traced allocation of each stage (tracemalloc).",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Stage profiler
+# ---------------------------------------------------------------------------
+
+@dataclass
+class StageStats:
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_bytes: Optional[int]
+    profile_path: Optional[str]
+
+
+class StageProfiler:
+    """Collect wall/CPU/peak-allocation stats for named pipeline stages.
+
+    When neither flag is enabled, `stage()` is a plain pass-through so the
+    CLIs pay nothing for the hooks.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        output_dir: str,
+        profile: bool = False,
+        trace_memory: bool = False,
+    ):
+        self.name = name
+        self.output_dir = os.path.join(output_dir, "profile")
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.stages: List[StageStats] = []
+        self._collapsed: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace, name: str, output_dir: str) -> "StageProfiler":
+        return cls(name, output_dir, profile=args.profile, trace_memory=args.trace_memory)
+
+    @property
+    def enabled(self) -> bool:
+        return self.profile or self.trace_memory
+
+    def stage(self, stage_name: str) -> "_Stage":
+        """Measure the wrapped block as one pipeline stage."""
+        return _Stage(self, stage_name)
+
+    def _record(
+        self,
+        stage_name: str,
+        wall: float,
+        cpu: float,
+        peak: Optional[int],
+        profiler: Optional[cProfile.Profile],
+    ) -> None:
+        profile_path = self._dump_profile(stage_name, profiler) if profiler else None
+        self.stages.append(StageStats(stage_name, wall, cpu, peak, profile_path))
+
+    # -- Output ---------------------------------------------------------------
+
+    def _dump_profile(self, stage_name: str, profiler: cProfile.Profile) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{self.name}.{stage_name}.prof")
+        profiler.dump_stats(path)
+
+        stats = pstats.Stats(profiler).stats
+        for func, (_, _, tottime, _, _) in stats.items():
+            micros = int(tottime * 1_000_000)
+            if micros <= 0 or _is_profiler_frame(func):
+                continue
+            stack = [f for f in _heaviest_call_path(stats, func) if not _is_profiler_frame(f)]
+            frames = [stage_name] + [_frame_label(f) for f in stack]
+            self._collapsed[";".join(frames)] += micros
+        return path
+
+    def report(self) -> None:
+        """Print the per-stage table and write the collapsed-stack file."""
+        if not self.enabled:
+            return
+
+        print("\n⏱️  Stage profile:")
+        header = f"   {'stage':<24}{'wall (s)':>10}{'cpu (s)':>10}"
+        if self.trace_memory:
+            header += f"{'peak alloc':>14}"
+        print(header)
+        for s in self.stages:
+            line = f"   {s.name:<24}{s.wall_seconds:>10.3f}{s.cpu_seconds:>10.3f}"
+            if self.trace_memory:
+                line += f"{_format_bytes(s.peak_bytes or 0):>14}"
+            print(line)
+        total_wall = sum(s.wall_seconds for s in self.stages)
+        total_cpu = sum(s.cpu_seconds for s in self.stages)
+        print(f"   {'total':<24}{total_wall:>10.3f}{total_cpu:>10.3f}")
+
+        if self.profile and self._collapsed:
+            collapsed_path = os.path.join(self.output_dir, f"{self.name}.collapsed")
+            with open(collapsed_path, "w", encoding="utf-8") as f:
+                for stack, micros in sorted(self._collapsed.items()):
+                    f.write(f"{stack} {micros}\n")
+            print(f"\n🔥 Profiles written to {self.output_dir}/")
+            print(f"   • {len(self.stages)} cProfile dumps ({self.name}.<stage>.prof)")
+            print(f"   • collapsed stacks (µs): {os.path.basename(collapsed_path)}")
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class _Stage:
+    """Context manager returned by `StageProfiler.stage()`.
+
+    A plain class rather than a @contextmanager generator so that cProfile,
+    enabled at the end of __enter__ and disabled first thing in __exit__,
+    only sees the stage body plus the __exit__ frame (filtered out of the
+    collapsed stacks by _is_profiler_frame).
+    """
+
+    def __init__(self, owner: StageProfiler, name: str):
+        self.owner = owner
+        self.name = name
+        self.profiler: Optional[cProfile.Profile] = None
+
+    def __enter__(self) -> None:
+        owner = self.owner
+        if not owner.enabled:
+            return
+        if owner.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.base_bytes = tracemalloc.get_traced_memory()[0]
+        self.profiler = cProfile.Profile() if owner.profile else None
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        if self.profiler:
+            self.profiler.enable()
+
+    def __exit__(self, *exc) -> bool:
+        if self.profiler:
+            self.profiler.disable()
+        owner = self.owner
+        if not owner.enabled:
+            return False
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        peak = None
+        if owner.trace_memory:
+            peak = max(tracemalloc.get_traced_memory()[1] - self.base_bytes, 0)
+        owner._record(self.name, wall, cpu, peak, self.profiler)
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+_THIS_FILE = os.path.abspath(__file__)
+_DISABLE_FRAME = "<method 'disable' of '_lsprof.Profiler' objects>"
+
+Func = Tuple[str, int, str]
+
+
+def _heaviest_call_path(stats: dict, func: Func) -> List[Func]:
+    """Walk up the caller graph, following the caller with the most cumulative
+    time, to approximate a root-to-leaf stack for `func`.
+
+    cProfile only records caller/callee pairs, so this is the usual
+    approximation used when turning pstats data into flamegraph input.
+    """
+    path = [func]
+    seen = {func}
+    current = func
+    while True:
+        callers = stats.get(current, (0, 0, 0, 0, {}))[4]
+        candidates = [(c, v[3]) for c, v in callers.items() if c not in seen]
+        if not candidates:
+            break
+        current = max(candidates, key=lambda item: item[1])[0]
+        seen.add(current)
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def _is_profiler_frame(func: Func) -> bool:
+    """The profiler's own bookkeeping frames (stage __exit__, disable())."""
+    filename, _, name = func
+    return name == _DISABLE_FRAME or os.path.abspath(filename) == _THIS_FILE
+
+
+def _frame_label(func: Func) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        # Built-ins are reported as ('~', 0, "<built-in method ...>")
+        return name.replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{lineno})".replace(";", ",")
+
+
+def _format_bytes(n: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"